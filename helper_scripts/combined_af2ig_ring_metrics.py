@@ -18,6 +18,13 @@ sys.modules["RINGImport"] = RINGImport
 ring_spec.loader.exec_module(RINGImport)
 create_ring_graph = RINGImport.create_ring_graph
 
+# We load interaction_filters (imported by the layout modules below)
+filters_path = Path("../layout/interaction_filters.py")
+filters_spec = importlib.util.spec_from_file_location("interaction_filters", filters_path)
+interaction_filters = importlib.util.module_from_spec(filters_spec)
+sys.modules["interaction_filters"] = interaction_filters
+filters_spec.loader.exec_module(interaction_filters)
+
 # We load BinderIntraInteraction
 binder_intra_path = Path("../layout/BinderIntraInteraction.py")
 binder_intra_spec = importlib.util.spec_from_file_location("BinderIntraInteraction", binder_intra_path)
@@ -18,6 +18,13 @@ spec.loader.exec_module(RINGImport)
 # Now you can access its contents
 create_ring_graph = RINGImport.create_ring_graph
 
+# Import the interaction filters shared by the layout modules below
+filters_module_path = Path("../layout/interaction_filters.py")
+filters_spec = importlib.util.spec_from_file_location("interaction_filters", filters_module_path)
+interaction_filters = importlib.util.module_from_spec(filters_spec)
+sys.modules["interaction_filters"] = interaction_filters
+filters_spec.loader.exec_module(interaction_filters)
+
 # Import binder intra interaction functions
 binder_module_path = Path("../layout/BinderIntraInteraction.py")
 binder_spec = importlib.util.spec_from_file_location("BinderIntraInteraction", binder_module_path)
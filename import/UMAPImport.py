@@ -86,42 +86,48 @@ class UMAPImport(tlp.Algorithm):
         try:
             # Open and read the CSV file
             with open(input_file, 'r', newline='') as f:
-                reader = csv.DictReader(f)
+                reader = csv.reader(f)
                 
                 # Check if required columns exist
-                fieldnames = reader.fieldnames
+                fieldnames = next(reader, [])
                 required_cols = ['filename', 'X', 'Y']
                 for col in required_cols:
                     if col not in fieldnames:
                         self.pluginProgress.setError(f"Required column '{col}' not found in file.")
                         return False
+                fn_idx = fieldnames.index('filename')
+                x_idx = fieldnames.index('X')
+                y_idx = fieldnames.index('Y')
                 
-                # Process each row
-                row_counter = 0
+                # Parse the needed columns once, without building a dict per row
+                filenames = []
+                xs = []
+                ys = []
                 for row in reader:
-                    # Create node
-                    node = self.new_graph.addNode()
-                    
+                    if not row:
+                        continue
+                    filenames.append(row[fn_idx])
+                    xs.append(float(row[x_idx]))
+                    ys.append(float(row[y_idx]))
+                
+                # Create all nodes in a single call
+                row_counter = len(filenames)
+                nodes = self.new_graph.addNodes(row_counter)
+                
+                for node, filename, x, y in zip(nodes, filenames, xs, ys):
                     # Set label to filename
-                    viewLabel[node] = row['filename']
+                    viewLabel[node] = filename
                     
                     # Store coordinates as properties
-                    x_coord[node] = float(row['X'])
-                    y_coord[node] = float(row['Y'])
+                    x_coord[node] = x
+                    y_coord[node] = y
                     
                     # Position node using scaled coordinates
-                    # Note: We use Y as Z coordinate to create a 2D visualization
-                    coord = tlp.Vec3f(
-                        float(row['X']) * scale_factor,
-                        float(row['Y']) * scale_factor,
-                        0.0,  # Z coordinate set to 0 for 2D view
-                    )
-                    viewLayout[node] = coord
-                    
-                    # Set node color using the user-defined color
-                    viewColor[node] = node_color
-                    
-                    row_counter += 1
+                    # Note: Z coordinate set to 0 for 2D view
+                    viewLayout[node] = tlp.Vec3f(x * scale_factor, y * scale_factor, 0.0)
+                
+                # Same color for every node
+                viewColor.setAllNodeValue(node_color)
                 
                 # Create a suitable view for the graph
                 if row_counter > 0:
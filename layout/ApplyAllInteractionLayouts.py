@@ -6,8 +6,8 @@ class ApplyAllInteractionLayouts(tlp.Algorithm):
     """
     This plugin applies all three interaction layout algorithms in sequence:
     1. Binder Target Interaction - Creates a bipartite layout for chain A-B interactions
-    2. Binder Target and Singleton Interaction - Shows remaining chain A-B and singleton interactions
-    3. Binder Intra Interaction - Shows interactions between contiguous H/E components in chain A
+    2. Binder Intra Interaction - Shows interactions between contiguous H/E components in chain A
+    3. Binder Target Connected Interaction - Copies the chain A-B interactions into a stress-minimized layout
 
     Requirements:
     - The graph must have node properties "chain", "position", "dssp"
@@ -32,6 +32,10 @@ class ApplyAllInteractionLayouts(tlp.Algorithm):
                                         True,
                                         False,
                                         "Layout orientation can be either 'vertical' (two columns) or 'horizontal' (two rows)")
+        # Forwarded to each algorithm: open node-link views on the created subgraphs
+        self.addBooleanParameter("create_view",
+                               "Open node-link views on the created subgraphs?",
+                               "True")
         
     def check(self):
         # Check if required properties exist
@@ -54,10 +58,12 @@ class ApplyAllInteractionLayouts(tlp.Algorithm):
         # Retrieve the user parameters
         include_vdw = self.dataSet["include_vdw"]
         layout_orientation = self.dataSet["layout_orientation"]
+        create_view = self.dataSet["create_view"]
 
         # 1. Apply Binder Target Interaction
         binder_target_params = tlp.getDefaultPluginParameters("Binder Target Interaction", self.graph)
         binder_target_params["include_vdw"] = include_vdw
+        binder_target_params["create_view"] = create_view
         success = self.graph.applyAlgorithm("Binder Target Interaction", binder_target_params)
         if not success:
             return False
@@ -66,6 +72,7 @@ class ApplyAllInteractionLayouts(tlp.Algorithm):
         binder_intra_params = tlp.getDefaultPluginParameters("Binder Intra Interaction", self.graph)
         binder_intra_params["include_vdw"] = include_vdw
         binder_intra_params["layout_orientation"] = layout_orientation
+        binder_intra_params["create_view"] = create_view
         success = self.graph.applyAlgorithm("Binder Intra Interaction", binder_intra_params)
         if not success:
             return False
@@ -73,6 +80,7 @@ class ApplyAllInteractionLayouts(tlp.Algorithm):
         # 3. Apply Binder Target Connected Interaction
         binder_target_connected_params = tlp.getDefaultPluginParameters("Binder Target Connected Interaction", self.graph)
         binder_target_connected_params["include_vdw"] = include_vdw
+        binder_target_connected_params["create_view"] = create_view
         success = self.graph.applyAlgorithm("Binder Target Connected Interaction", binder_target_connected_params)
         if not success:
             return False
@@ -1,189 +1,146 @@
 from tulip import tlp
 from tulipgui import tlpgui
 import tulipplugins
+import math
+from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
+from interaction_filters import interaction_filter, is_covalent, safe_pos
 
-def calculate_edge_lengths(graph, nodes, view_layout):
+def build_interaction_adjacency(graph, nodes, prop_interaction, include_vdw):
     """
-    Calculate total edge length for a set of nodes.
-    
-    Args:
-        graph: The Tulip graph
-        nodes: List of nodes
-        view_layout: The layout property of the graph
-        
-    Returns:
-        Total edge length
+    Build the adjacency of the given nodes restricted to interesting,
+    non-covalent edges: node -> list of (other endpoint, edge).
+    Each edge is classified once, even when both of its ends are in nodes.
     """
-    total_length = 0.0
-    node_set = set(nodes)
-    
+    get_interaction = prop_interaction.getEdgeValue
+    keep = interaction_filter(include_vdw)
+    # interaction strings come from a small set ("HBOND:SC_MC", "VDW:SC_SC", ...):
+    # run the string tests once per distinct string, then once per edge
+    type_ok = {}
+    edge_ok = {}
+    adj = defaultdict(list)
     for n in nodes:
         for e in graph.getInOutEdges(n):
-            if graph.source(e) in node_set and graph.target(e) in node_set:
-                src = view_layout[graph.source(e)]
-                tgt = view_layout[graph.target(e)]
-                total_length += (src - tgt).norm()
-    
-    return total_length
-
-# Helper: convert 'position' to a usable int
-def get_position_int(n, prop_position):
-    try:
-        return int(prop_position[n])
-    except:
-        return -999999
-
-# Decide which edges are "interesting"
-def is_interesting_interaction(int_type, include_vdw):
-    if not int_type:
-        return False
-    if int_type.startswith("VDW"):
-        return include_vdw  # only keep VDW if user wants it
-    # accept everything else (HBOND, IONIC, etc.)
-    return True
-
-# Decide if an interaction is covalent (we skip these)
-def is_covalent(int_type):
-    if not int_type:
-        return False
-    # e.g. "COV:PEP", "COV", "PEPTIDE BOND", etc.
-    return (int_type.startswith("COV") or "PEPTIDE" in int_type.upper())
-
-def flush_component(node_list, dssp_code, start_p, end_p, components):
-    if node_list and dssp_code in ("H","E"):
-        components.append({
-            "nodes":    list(node_list),
-            "dssp":     dssp_code,
-            "startPos": start_p,
-            "endPos":   end_p
-        })
-
-# ------------------------------------------------------------------
-# For each pair of these components, check if they interact
-# and if so, create a subgraph with bipartite layout
-# ------------------------------------------------------------------
-def do_components_interact(compA, compB, prop_interaction, include_vdw, graph):
-    nodeSetA = set(compA["nodes"])
-    nodeSetB = set(compB["nodes"])
-    for nA in nodeSetA:
-        for e in graph.getInOutEdges(nA):
-            itype = prop_interaction[e]
-            if not is_interesting_interaction(itype, include_vdw):
-                continue
-            if is_covalent(itype):
-                continue
-            nOther = graph.target(e) if graph.source(e) == nA else graph.source(e)
-            if nOther in nodeSetB:
-                return True
-    return False
-
-def layout_bipartite(compA_nodes, compB_nodes, sub_layout, graph, prop_position, layout_orientation="vertical"):
+            ok = edge_ok.get(e)
+            if ok is None:
+                itype = get_interaction(e)
+                ok = type_ok.get(itype)
+                if ok is None:
+                    ok = keep(itype) and not is_covalent(itype)
+                    type_ok[itype] = ok
+                edge_ok[e] = ok
+            if ok:
+                adj[n].append((graph.opposite(e, n), e))
+    return adj
+
+# orientation -> (compA origin, compB origin, step between consecutive nodes)
+_BIPARTITE_AXES = {
+    "vertical":   ((0.0, 0.0), (3.0, 0.0), (0.0, -1.5)),  # two columns
+    "horizontal": ((0.0, 0.0), (0.0, -1.5), (3.0, 0.0)),  # two rows
+}
+
+def _place(nodes, origin, step, sub_layout):
+    """Put nodes on a line from origin, one step apart (one write per node)."""
+    (x0, y0), (dx, dy) = origin, step
+    Vec3f = tlp.Vec3f
+    for i, nd in enumerate(nodes):
+        sub_layout[nd] = Vec3f(x0 + i * dx, y0 + i * dy, 0)
+
+def layout_bipartite(compA_nodes, compB_nodes, sub_layout, graph, layout_orientation="vertical"):
     """
     Places compA_nodes & compB_nodes in a bipartite arrangement:
         - 'vertical': two columns
         - 'horizontal': two rows
+    layout_orientation must be one of these two values.
+    Both node lists are expected in ascending position order
+    (components are built from the position-sorted chain).
+
+    compB is laid out either in position order or reversed, whichever
+    gives the shorter total length for all graph edges between the two
+    components (covalent and VDW ones included, whatever the filter;
+    edges inside a component keep their length either way). Node
+    coordinates only depend on their index along the line, so both
+    lengths are computed before anything is written.
     """
-    # sort each group by ascending position
-    compA_nodes = sorted(compA_nodes, key=lambda n: get_position_int(n, prop_position))
-    compB_nodes = sorted(compB_nodes, key=lambda n: get_position_int(n, prop_position))
-
-    if layout_orientation == "vertical":
-        left_x  = 0.0
-        right_x = 3.0
-        top_y   = 0.0
-        step_y  = -1.5
-
-        # First try with compB in original order
-        yA = top_y
-        for ndA in compA_nodes:
-            sub_layout[ndA] = tlp.Vec3f(left_x, yA, 0)
-            yA += step_y
-
-        yB = top_y
-        for ndB in compB_nodes:
-            sub_layout[ndB] = tlp.Vec3f(right_x, yB, 0)
-            yB += step_y
-
-        # Calculate edge lengths for original orientation
-        orig_length = calculate_edge_lengths(graph, compA_nodes + compB_nodes, sub_layout)
-
-        # Try reversed compB
-        yB = top_y
-        for ndB in reversed(compB_nodes):
-            sub_layout[ndB] = tlp.Vec3f(right_x, yB, 0)
-            yB += step_y
-
-        # Calculate edge lengths for reversed orientation
-        reversed_length = calculate_edge_lengths(graph, compA_nodes + compB_nodes, sub_layout)
-
-        # Choose orientation with shorter total edge length
-        if reversed_length < orig_length:
-            # Keep the reversed orientation
-            pass
-        else:
-            # Revert back to original orientation
-            yB = top_y
-            for ndB in compB_nodes:
-                sub_layout[ndB] = tlp.Vec3f(right_x, yB, 0)
-                yB += step_y
-
-    elif layout_orientation == "horizontal":
-        top_y     = 0.0
-        bottom_y  = -1.5
-        left_x    = 0.0
-        step_x    = 3.0
-
-        # First try with compB in original order
-        xA = left_x
-        for ndA in compA_nodes:
-            sub_layout[ndA] = tlp.Vec3f(xA, top_y, 0)
-            xA += step_x
-
-        xB = left_x
-        for ndB in compB_nodes:
-            sub_layout[ndB] = tlp.Vec3f(xB, bottom_y, 0)
-            xB += step_x
-
-        # Calculate edge lengths for original orientation
-        orig_length = calculate_edge_lengths(graph, compA_nodes + compB_nodes, sub_layout)
-
-        # Try reversed compB
-        xB = left_x
-        for ndB in reversed(compB_nodes):
-            sub_layout[ndB] = tlp.Vec3f(xB, bottom_y, 0)
-            xB += step_x
-
-        # Calculate edge lengths for reversed orientation
-        reversed_length = calculate_edge_lengths(graph, compA_nodes + compB_nodes, sub_layout)
-
-        # Choose orientation with shorter total edge length
-        if reversed_length < orig_length:
-            # Keep the reversed orientation
-            pass
-        else:
-            # Revert back to original orientation
-            xB = left_x
-            for ndB in compB_nodes:
-                sub_layout[ndB] = tlp.Vec3f(xB, bottom_y, 0)
-                xB += step_x
-
-    else:
-        # fallback => vertical
-        print(f"[WARNING] Unrecognized layout_orientation={layout_orientation}, using vertical fallback.")
-        left_x  = 0.0
-        right_x = 3.0
-        top_y   = 0.0
-        step_y  = -1.5
-
-        yA = top_y
-        for ndA in compA_nodes:
-            sub_layout[ndA] = tlp.Vec3f(left_x, yA, 0)
-            yA += step_y
-
-        yB = top_y
-        for ndB in compB_nodes:
-            sub_layout[ndB] = tlp.Vec3f(right_x, yB, 0)
-            yB += step_y
+    (ax, ay), (bx, by), (dx, dy) = _BIPARTITE_AXES[layout_orientation]
+    off_x, off_y = bx - ax, by - ay
+
+    idxA = {n: i for i, n in enumerate(compA_nodes)}
+    last_b = len(compB_nodes) - 1
+
+    orig_length = 0.0
+    reversed_length = 0.0
+    for iB, ndB in enumerate(compB_nodes):
+        for e in graph.getInOutEdges(ndB):
+            iA = idxA.get(graph.opposite(e, ndB))
+            if iA is None:
+                continue
+            k = iB - iA
+            orig_length += math.hypot(off_x + k * dx, off_y + k * dy)
+            k = (last_b - iB) - iA
+            reversed_length += math.hypot(off_x + k * dx, off_y + k * dy)
+
+    # Choose orientation with shorter total edge length. Mirror-symmetric
+    # contacts give totals equal up to float rounding (the terms are summed
+    # in a different order), so only reverse when clearly shorter: ties keep
+    # residue order.
+    if reversed_length < orig_length * (1.0 - 1e-9):
+        compB_nodes = compB_nodes[::-1]
+
+    _place(compA_nodes, (ax, ay), (dx, dy), sub_layout)
+    _place(compB_nodes, (bx, by), (dx, dy), sub_layout)
+
+def find_he_components(graph):
+    """
+    Find the contiguous runs of H or E residues (dssp) on chain A.
+    
+    Args:
+        graph: The Tulip graph (with "chain", "position" and "dssp" node properties)
+        
+    Returns:
+        List of dicts { "nodes", "node_set", "dssp", "startPos", "endPos" },
+        sorted by start position; "nodes" are in position order
+    """
+    # Fetch properties directly from the graph
+    prop_chain = graph["chain"]
+    prop_position = graph["position"]
+    prop_dssp = graph["dssp"]
+
+    # bound getters skip the generic __getitem__ dispatch in the loops below
+    get_chain = prop_chain.getNodeValue
+    get_dssp = prop_dssp.getNodeValue
+
+    chain_a_nodes = [n for n in graph.getNodes() if get_chain(n) == "A"]
+
+    # read each position once; the sort and the scan index this cache
+    pos_map = {n: safe_pos(prop_position, n) for n in chain_a_nodes}
+    chain_a_nodes.sort(key=pos_map.__getitem__)
+
+    components = []
+
+    # Along the sorted chain, position - index stays constant while positions
+    # are consecutive, so grouping on (dssp, position - index) yields exactly
+    # the contiguous runs of identical dssp codes, in a single linear pass.
+    def run_key(item):
+        i, nd = item
+        return (get_dssp(nd) or "", pos_map[nd] - i)  # handle None => ""
+
+    for (d, _), run in groupby(enumerate(chain_a_nodes), key=run_key):
+        if d not in ("H", "E"):
+            continue
+        nodes = [nd for _, nd in run]
+        components.append({
+            "nodes":    nodes,
+            "node_set": frozenset(nodes),
+            "dssp":     d,
+            "startPos": pos_map[nodes[0]],
+            "endPos":   pos_map[nodes[-1]]
+        })
+
+    # sort components by start position
+    components.sort(key=itemgetter("startPos"))
+    return components
 
 def generate_subgraphs(graph, include_vdw, layout_orientation="vertical", plugin_progress=None):
     """
@@ -198,149 +155,83 @@ def generate_subgraphs(graph, include_vdw, layout_orientation="vertical", plugin
     Returns:
         List of created subgraphs
     """
-    # Fetch properties directly from the graph
-    prop_chain = graph["chain"]
-    prop_position = graph["position"]
-    prop_dssp = graph["dssp"]
     prop_interaction = graph["interaction"]
-    
+
     # ------------------------------------------------------------------
     # 1) Identify chain A's contiguous H/E components
     # ------------------------------------------------------------------
-    chain_a_nodes = [n for n in graph.getNodes() if prop_chain[n] == "A"]
-    chain_a_nodes.sort(key=lambda n: get_position_int(n, prop_position))
+    components = find_he_components(graph)
 
-    components = []  # will store dicts: { "nodes", "dssp", "startPos", "endPos" }
+    # ------------------------------------------------------------------
+    # 2) Find interacting pairs with a single sweep over component edges
+    # ------------------------------------------------------------------
+    node2comp = {n: i for i, comp in enumerate(components) for n in comp["nodes"]}
+
+    adj = build_interaction_adjacency(graph, node2comp, prop_interaction, include_vdw)
+
+    # (i, j) with i < j -> non-covalent, interesting edges between the two,
+    # and the nodes at their ends
+    interacts = defaultdict(list)
+    interacting_nodes = defaultdict(set)
+    for n, i in node2comp.items():
+        for nOther, e in adj.get(n, ()):
+            j = node2comp.get(nOther)
+            # every edge is met from both ends, keep it from the lower component
+            if j is not None and i < j:
+                interacts[(i, j)].append(e)
+                interacting_nodes[(i, j)].update((n, nOther))
 
-    curr_nodes = []
-    curr_dssp  = None
-    curr_start = None
-    curr_end   = None
-    prev_pos   = None
+    created_subgraphs = []
 
-    for i, nd in enumerate(chain_a_nodes):
-        d = prop_dssp[nd] or ""  # handle None => ""
-        p = get_position_int(nd, prop_position)
-        
-        if i == 0:
-            # first residue in chain A
-            if d in ("H","E"):
-                curr_nodes = [nd]
-                curr_dssp  = d
-                curr_start = p
-                curr_end   = p
+    # Create subgraphs for interacting pairs
+    for (i, j) in sorted(interacts):
+        pair_edges = interacts[(i, j)]
+
+        compA = components[i]
+        compB = components[j]
+
+        sub_name = f"CompA_{compA['startPos']}_{compA['endPos']}__CompB_{compB['startPos']}_{compB['endPos']}"
+        subg = graph.getSubGraph(sub_name)
+        if subg is None:
+            subg = graph.addSubGraph(sub_name)
         else:
-            if curr_nodes:  # we're building a run
-                if (d == curr_dssp) and (p == prev_pos + 1) and (d in ("H","E")):
-                    # continue the same run
-                    curr_nodes.append(nd)
-                    curr_end = p
-                else:
-                    # flush old run
-                    flush_component(curr_nodes, curr_dssp, curr_start, curr_end, components)
-                    # start new if this residue is H/E
-                    if d in ("H","E"):
-                        curr_nodes = [nd]
-                        curr_dssp  = d
-                        curr_start = p
-                        curr_end   = p
-                    else:
-                        # reset
-                        curr_nodes = []
-                        curr_dssp  = None
-                        curr_start = None
-                        curr_end   = None
-            else:
-                # not building a run
-                if d in ("H","E"):
-                    curr_nodes = [nd]
-                    curr_dssp  = d
-                    curr_start = p
-                    curr_end   = p
-        prev_pos = p
-
-    # final flush at end
-    if curr_nodes:
-        flush_component(curr_nodes, curr_dssp, curr_start, curr_end, components)
+            # clear existing content in one call (node removal drops their edges);
+            # the subgraph itself is kept so views opened on it stay attached
+            subg.delNodes(subg.nodes())
 
-    # sort components by start position
-    components.sort(key=lambda c: c["startPos"])
+        sub_layout = subg.getLocalLayoutProperty("viewLayout")
 
-    created_subgraphs = []
+        # gather all nodes
+        all_nodes = compA["node_set"] | compB["node_set"]
+        subg.addNodes(list(all_nodes))
 
-    # Create subgraphs for interacting pairs
-    for i in range(len(components)):
-        for j in range(i+1, len(components)):
-            compA = components[i]
-            compB = components[j]
-
-            if do_components_interact(compA, compB, prop_interaction, include_vdw, graph):
-                sub_name = f"CompA_{compA['startPos']}_{compA['endPos']}__CompB_{compB['startPos']}_{compB['endPos']}"
-                subg = graph.getSubGraph(sub_name)
-                if subg:
-                    # clear old content
-                    for nd in list(subg.getNodes()):
-                        subg.delNode(nd)
-                    for e in list(subg.getEdges()):
-                        subg.delEdge(e)
-                else:
-                    subg = graph.addSubGraph(sub_name)
-
-                sub_layout = subg.getLocalLayoutProperty("viewLayout")
-
-                # gather all nodes
-                all_nodes = set(compA["nodes"] + compB["nodes"])
-                for nd in all_nodes:
-                    subg.addNode(nd)
-
-                # Track nodes that have interactions
-                nodes_with_interactions = set()
-
-                # gather edges (non-covalent, interesting)
-                for nd in all_nodes:
-                    for e in graph.getInOutEdges(nd):
-                        itype = prop_interaction[e]
-                        if not is_interesting_interaction(itype, include_vdw):
-                            continue
-                        if is_covalent(itype):
-                            continue
-                        nOther = graph.target(e) if graph.source(e) == nd else graph.source(e)
-                        # Only keep edges that connect between different components
-                        if nOther in all_nodes:
-                            # Check if the edge connects between different components
-                            if ((nd in compA["nodes"] and nOther in compB["nodes"]) or 
-                                (nd in compB["nodes"] and nOther in compA["nodes"])):
-                                subg.addEdge(e)
-                                nodes_with_interactions.add(nd)
-                                nodes_with_interactions.add(nOther)
-
-                # Set opacity for nodes without interactions using viewColor
-                prop_viewParentColor = subg.getColorProperty("viewColor")
-                prop_viewColor = subg.getLocalColorProperty("viewColor")
-                
-                # Copy parent colors to local property for edges
-                for e in subg.getEdges():
-                    prop_viewColor[e] = prop_viewParentColor[e]
-                
-                # Set opacity for nodes without interactions
-                for nd in all_nodes:
-                    if nd not in nodes_with_interactions:
-                        # Get current color and set alpha to 64 (1/4 opacity)
-                        current_color = prop_viewParentColor[nd]
-                        prop_viewColor[nd] = tlp.Color(current_color[0], current_color[1], current_color[2], 64)
-                    else:
-                        # Make sure to get the parent color first
-                        current_color = prop_viewParentColor[nd]
-                        prop_viewColor[nd] = tlp.Color(current_color[0], current_color[1], current_color[2], 255)
-
-                # bipartite layout
-                layout_bipartite(compA["nodes"], compB["nodes"], sub_layout, graph, prop_position, layout_orientation)
-                if plugin_progress:
-                    plugin_progress.setComment(
-                        f"Created subgraph '{sub_name}' in {layout_orientation} bipartite layout."
-                    )
-                    
-                created_subgraphs.append(subg)
+        # edges were already classified above
+        subg.addEdges(pair_edges)
+
+        # Nodes that have interactions
+        nodes_with_interactions = interacting_nodes[(i, j)]
+
+        # Set opacity for nodes without interactions using viewColor
+        prop_viewParentColor = subg.getColorProperty("viewColor")
+        prop_viewColor = subg.getLocalColorProperty("viewColor")
+        
+        # Copy parent colors for all nodes and edges of the subgraph at once
+        prop_viewColor.copy(prop_viewParentColor)
+        
+        # Set opacity for nodes without interactions
+        for nd in all_nodes - nodes_with_interactions:
+            # Get current color and set alpha to 64 (1/4 opacity)
+            current_color = prop_viewParentColor[nd]
+            prop_viewColor[nd] = tlp.Color(current_color[0], current_color[1], current_color[2], 64)
+
+        # bipartite layout
+        layout_bipartite(compA["nodes"], compB["nodes"], sub_layout, graph, layout_orientation)
+        if plugin_progress:
+            plugin_progress.setComment(
+                f"Created subgraph '{sub_name}' in {layout_orientation} bipartite layout."
+            )
+            
+        created_subgraphs.append(subg)
     
     return created_subgraphs
 
@@ -372,6 +263,10 @@ class BinderIntraInteraction(tlp.Algorithm):
                                         True,
                                         False,
                                         "Layout orientation can be either 'vertical' (two columns) or 'horizontal' (two rows)")
+        # Opening views can be skipped when the plugin is run from a script
+        self.addBooleanParameter("create_view",
+                                 "Open a node-link view for each subgraph?",
+                                 "True")
 
     def check(self):
         # Optionally check if needed properties exist
@@ -383,8 +278,14 @@ class BinderIntraInteraction(tlp.Algorithm):
 
     def run(self):
         # Retrieve the user parameters
-        include_vdw = self.dataSet["include_vdw"]
+        include_vdw = bool(self.dataSet["include_vdw"])
         layout_orientation = self.dataSet["layout_orientation"]
+        if layout_orientation not in ("vertical", "horizontal"):
+            if self.pluginProgress:
+                self.pluginProgress.setError(
+                    f"Unrecognized layout_orientation '{layout_orientation}', expected 'vertical' or 'horizontal'."
+                )
+            return False
         
         # Generate subgraphs and get the list of created ones
         created_subgraphs = generate_subgraphs(
@@ -395,15 +296,23 @@ class BinderIntraInteraction(tlp.Algorithm):
         )
         
         # Create views for each subgraph
-        for subg in created_subgraphs:
-            # Create and configure the view for this subgraph
-            nlv_binder_intra_sub = tlpgui.createNodeLinkDiagramView(subg)
-            # Set labels scaled to node sizes mode
-            renderingParameters = nlv_binder_intra_sub.getRenderingParameters()
-            renderingParameters.setLabelScaled(True)
-            nlv_binder_intra_sub.setRenderingParameters(renderingParameters)
-            # Center the layout
-            nlv_binder_intra_sub.centerView()            
+        if self.dataSet["create_view"]:
+            renderingParameters = None
+            for subg in created_subgraphs:
+                opened_views = tlpgui.getViewsOfGraph(subg)
+                if opened_views:
+                    # subgraph reused from a previous run: keep its view
+                    opened_views[0].centerView()
+                    continue
+                # Create and configure the view for this subgraph
+                nlv_binder_intra_sub = tlpgui.createNodeLinkDiagramView(subg)
+                # Set labels scaled to node sizes mode (same parameters for all views)
+                if renderingParameters is None:
+                    renderingParameters = nlv_binder_intra_sub.getRenderingParameters()
+                    renderingParameters.setLabelScaled(True)
+                nlv_binder_intra_sub.setRenderingParameters(renderingParameters)
+                # Center the layout
+                nlv_binder_intra_sub.centerView()
 
         if self.pluginProgress:
             self.pluginProgress.setComment(
@@ -418,7 +327,8 @@ For chain A only, find contiguous runs of H or E (based on dssp property),
 then for each pair that interacts non-covalently, create a subgraph with a bipartite layout.
 User parameters:
  - include_vdw: boolean to include or exclude VDW edges,
- - layout_orientation: "vertical" (two columns) or "horizontal" (two rows).
+ - layout_orientation: "vertical" (two columns) or "horizontal" (two rows),
+ - create_view: whether to open a node-link view for each subgraph.
 """
 
 tulipplugins.registerPluginOfGroup(
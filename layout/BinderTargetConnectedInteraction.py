@@ -3,29 +3,6 @@ from tulipgui import tlpgui
 import tulipplugins
 
 
-###############################################################################
-# Helper function: given an edge interaction string, decide if we keep it
-###############################################################################
-def is_interesting_interaction(int_type, include_vdw):
-    """
-    Return True if the interaction is accepted by user choice
-    (include_vdw toggles VDW).
-    """
-    if not int_type:
-        return False
-    if int_type.startswith("VDW"):
-        return include_vdw
-    # Otherwise, accept (HBOND, IONIC, etc.)
-    return True
-
-def is_covalent(int_type):
-    """
-    We consider 'COV...' or '...PEPTIDE...' to be covalent (skip them).
-    """
-    if not int_type:
-        return False
-    return (int_type.startswith("COV") or "PEPTIDE" in int_type.upper())
-
 ###############################################################################
 # Main plugin
 ###############################################################################
@@ -44,13 +21,17 @@ class BinderTargetConnectedInteraction(tlp.Algorithm):
         self.addBooleanParameter("include_vdw",
                                  "Include VDW interactions in the subgraph?",
                                  "True")
+        # Opening a view can be skipped when the plugin is run from a script
+        self.addBooleanParameter("create_view",
+                                 "Open a new node-link view?",
+                                 "True")
 
     def check(self):
         # No specific checks
         return (True, "")
 
     def run(self):
-        include_vdw = self.dataSet["include_vdw"]
+        include_vdw = bool(self.dataSet["include_vdw"])
 
         subgraphs = self.graph.getSubGraphs()
         binder_target_interaction_subgraph = None
@@ -68,28 +49,33 @@ class BinderTargetConnectedInteraction(tlp.Algorithm):
             binder_target_connected_subgraph = self.graph.addSubGraph("BinderTargetConnectedInteraction")
             
             # Copy all nodes and edges from BinderTargetInteraction
-            for node in binder_target_interaction_subgraph.getNodes():
-                binder_target_connected_subgraph.addNode(node)
-                
-            for edge in binder_target_interaction_subgraph.getEdges():
-                binder_target_connected_subgraph.addEdge(edge)
+            binder_target_connected_subgraph.addNodes(binder_target_interaction_subgraph.nodes())
+            binder_target_connected_subgraph.addEdges(binder_target_interaction_subgraph.edges())
+
+            # Start from the bipartite layout of BinderTargetInteraction.
+            # The layout is local to the subgraph: the root graph's viewLayout is left untouched.
+            bt_layout = binder_target_interaction_subgraph.getLayoutProperty("viewLayout")
+            new_layout = binder_target_connected_subgraph.getLocalLayoutProperty("viewLayout")
+            new_layout.copy(bt_layout)
             
             # Apply Stress Minimization layout to improve the visualization
             params = tlp.getDefaultPluginParameters('Stress Minimization (OGDF)', binder_target_connected_subgraph)
             # Configure parameters for better layout
+            params['has initial layout'] = True
             params['number of iterations'] = 5
             params['edge costs'] = 2
             # Apply the layout algorithm
             binder_target_connected_subgraph.applyLayoutAlgorithm('Stress Minimization (OGDF)', params)
 
             # Create and configure the view for this subgraph
-            nlv_binder_target_connected_interaction_sub = tlpgui.createNodeLinkDiagramView(binder_target_connected_subgraph)
-            # Set labels scaled to node sizes mode
-            renderingParameters = nlv_binder_target_connected_interaction_sub.getRenderingParameters()
-            renderingParameters.setLabelScaled(True)
-            nlv_binder_target_connected_interaction_sub.setRenderingParameters(renderingParameters)
-            # Center the layout
-            nlv_binder_target_connected_interaction_sub.centerView()
+            if self.dataSet["create_view"]:
+                nlv_binder_target_connected_interaction_sub = tlpgui.createNodeLinkDiagramView(binder_target_connected_subgraph)
+                # Set labels scaled to node sizes mode
+                renderingParameters = nlv_binder_target_connected_interaction_sub.getRenderingParameters()
+                renderingParameters.setLabelScaled(True)
+                nlv_binder_target_connected_interaction_sub.setRenderingParameters(renderingParameters)
+                # Center the layout
+                nlv_binder_target_connected_interaction_sub.centerView()
 
 
             # done
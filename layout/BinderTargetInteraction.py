@@ -1,71 +1,44 @@
 from tulip import tlp
 from tulipgui import tlpgui
 import tulipplugins
+import math
+from interaction_filters import interaction_filter, safe_pos
 
-from BinderIntraInteraction import calculate_edge_lengths
-
-def is_interesting_interaction(inter_type, include_vdw):
-    """
-    Include only non-VDW or VDW if user requested.
-    """
-    if not inter_type:
-        return False
-    if inter_type.startswith("VDW"):
-        # only include if user wants VDW
-        return include_vdw
-    # otherwise accept e.g. HBOND, IONIC, etc.
-    return True
-
-def get_pos_int(node, prop_position):
-    """
-    Safe integer conversion for 'Position' property.
-    """
-    try:
-        return int(prop_position[node])
-    except:
-        return -9999999
-
-def identify_interacting_nodes(graph, include_vdw):
+def identify_interactions(graph, include_vdw):
     """
-    Identifies nodes from chain A and B that interact with each other.
-    Returns sorted lists of interacting binder and target nodes.
+    Identifies nodes from chain A and B that interact with each other,
+    together with the edges of the subgraph they induce, in one edge sweep.
+    Returns sorted lists of interacting binder and target nodes, and the
+    list of interesting edges whose two ends are interacting nodes.
     """
     # Get properties from graph
     prop_chain = graph["chain"]
     prop_position = graph["position"]
     prop_interaction = graph["interaction"]
     
-    # Separate chain A (binder) vs chain B (target)
-    binder_nodes = []
-    target_nodes = []
-
-    for n in graph.getNodes():
-        c = prop_chain[n]
-        if c == "A":  # binder
-            binder_nodes.append(n)
-        elif c == "B":  # target
-            target_nodes.append(n)
-        else:
-            # ignoring other chains
-            pass
-
-    # Sort them by residue number
-    binder_nodes.sort(key=lambda n: get_pos_int(n, prop_position))
-    target_nodes.sort(key=lambda n: get_pos_int(n, prop_position))
+    # Chain of every node, read once and reused in the edge loop
+    # (chain A = binder, chain B = target, other chains are ignored)
+    chain_of = {n: prop_chain[n] for n in graph.getNodes()}
 
     # Identify chain B subset that interacts with chain A
     interacting_binder_set = set()
     interacting_target_set = set()
+    # interesting A/B edges, kept to build the subgraph without a second sweep
+    candidate_edges = []
 
+    get_interaction = prop_interaction.getEdgeValue
+    keep = interaction_filter(include_vdw)
     for e in graph.getEdges():
-        inter_type = prop_interaction[e]
-        if not is_interesting_interaction(inter_type, include_vdw):
+        # chain test first: it is a dict lookup and skips other chains
+        n1, n2 = graph.ends(e)
+        c1 = chain_of[n1]
+        c2 = chain_of[n2]
+        if c1 not in ("A", "B") or c2 not in ("A", "B"):
             continue
 
-        n1 = graph.source(e)
-        n2 = graph.target(e)
-        c1 = prop_chain[n1]
-        c2 = prop_chain[n2]
+        if not keep(get_interaction(e)):
+            continue
+        candidate_edges.append((e, n1, n2))
 
         if c1 == "A" and c2 == "B":
             interacting_binder_set.add(n1)
@@ -74,16 +47,32 @@ def identify_interacting_nodes(graph, include_vdw):
             interacting_binder_set.add(n2)
             interacting_target_set.add(n1)
 
-    interacting_binder_list = sorted(list(interacting_binder_set), 
-                                    key=lambda n: get_pos_int(n, prop_position))
-    interacting_target_list = sorted(list(interacting_target_set), 
-                                    key=lambda n: get_pos_int(n, prop_position))
+    # Sort them by residue number, reading each position only once
+    binder_target_nodes = interacting_binder_set | interacting_target_set
+    pos_of = {n: safe_pos(prop_position, n) for n in binder_target_nodes}
+    interacting_binder_list = sorted(interacting_binder_set, key=pos_of.__getitem__)
+    interacting_target_list = sorted(interacting_target_set, key=pos_of.__getitem__)
+
+    # Edges of the induced subgraph (A-B as well as A-A / B-B between interacting nodes)
+    interaction_edges = [e for e, n1, n2 in candidate_edges
+                         if n1 in binder_target_nodes and n2 in binder_target_nodes]
     
+    return interacting_binder_list, interacting_target_list, interaction_edges
+
+def identify_interacting_nodes(graph, include_vdw):
+    """
+    Identifies nodes from chain A and B that interact with each other.
+    Returns sorted lists of interacting binder and target nodes.
+    """
+    interacting_binder_list, interacting_target_list, _ = identify_interactions(graph, include_vdw)
     return interacting_binder_list, interacting_target_list
 
-def create_interaction_subgraph(graph, interacting_binder_list, interacting_target_list, include_vdw):
+def create_interaction_subgraph(graph, interacting_binder_list, interacting_target_list, include_vdw,
+                                interaction_edges=None):
     """
     Creates or resets a subgraph containing the interacting nodes.
+    If interaction_edges (as returned by identify_interactions) is given,
+    those edges are added directly instead of scanning the graph again.
     Returns the subgraph.
     """
     # Get property from graph
@@ -93,60 +82,73 @@ def create_interaction_subgraph(graph, interacting_binder_list, interacting_targ
     if binder_target_sub is None:
         binder_target_sub = graph.addSubGraph("BinderTargetInteraction")
     else:
-        # clear existing content
-        for n in list(binder_target_sub.getNodes()):
-            binder_target_sub.delNode(n)
-        for e in list(binder_target_sub.getEdges()):
-            binder_target_sub.delEdge(e)
+        # clear existing content in one call (node removal drops their edges);
+        # the subgraph itself is kept so views opened on it stay attached
+        binder_target_sub.delNodes(binder_target_sub.nodes())
 
-    # Add nodes
-    binder_target_nodes = set(interacting_binder_list + interacting_target_list)
-    for n in binder_target_nodes:
-        binder_target_sub.addNode(n)
+    # Add nodes (binders are in chain A and targets in chain B, the lists are disjoint)
+    binder_target_nodes = interacting_binder_list + interacting_target_list
+    binder_target_sub.addNodes(binder_target_nodes)
 
     # Add edges
-    for e in graph.getEdges():
-        s = graph.source(e)
-        t = graph.target(e)
-        if (s in binder_target_nodes) and (t in binder_target_nodes):
-            inter_type = prop_interaction[e]
-            if is_interesting_interaction(inter_type, include_vdw):
-                binder_target_sub.addEdge(e)
+    if interaction_edges is None:
+        interaction_edges = []
+        keep = interaction_filter(include_vdw)
+        # membership bitmap indexed by node id
+        max_id = max((n.id for n in binder_target_nodes), default=-1)
+        in_sub = bytearray(max_id + 1)
+        for n in binder_target_nodes:
+            in_sub[n.id] = 1
+        for e in graph.getEdges():
+            s, t = graph.ends(e)
+            if s.id <= max_id and t.id <= max_id and in_sub[s.id] and in_sub[t.id]:
+                if keep(prop_interaction[e]):
+                    interaction_edges.append(e)
+    binder_target_sub.addEdges(interaction_edges)
                 
     return binder_target_sub
 
 def layout_bipartite_subgraph(graph, interacting_binder_list, interacting_target_list, sub_view_layout):
     """
     Creates a bipartite layout for the subgraph and selects the best orientation.
+
+    Target nodes are kept in position order or reversed, whichever gives the
+    shorter total length for the binder-target edges (edges within one chain
+    keep their length either way). Positions only depend on the node index,
+    so both totals are computed before the layout is written once.
     """
     space_x = 1.5
+    space_y = 3.0
+
+    idx_binder = {n: i for i, n in enumerate(interacting_binder_list)}
+    last_target = len(interacting_target_list) - 1
+
+    orig_length = 0.0
+    reversed_length = 0.0
+    for iB, nodeB in enumerate(interacting_target_list):
+        for e in graph.getInOutEdges(nodeB):
+            iA = idx_binder.get(graph.opposite(e, nodeB))
+            if iA is None:
+                continue
+            orig_length += math.hypot(space_x * (iA - iB), space_y)
+            reversed_length += math.hypot(space_x * (iA - (last_target - iB)), space_y)
+
+    # Choose orientation with shorter total edge length. Mirror-symmetric
+    # contacts give totals equal up to float rounding (the terms are summed
+    # in a different order), so only reverse when clearly shorter: ties keep
+    # residue order.
+    if reversed_length < orig_length * (1.0 - 1e-9):
+        target_order = interacting_target_list[::-1]
+    else:
+        target_order = interacting_target_list
 
-    # First try with target nodes in original order
-    for i, nodeB in enumerate(interacting_target_list):
+    # Place target nodes (chain B) horizontally at y=0
+    for i, nodeB in enumerate(target_order):
         sub_view_layout[nodeB] = tlp.Vec3f(i * space_x, 0.0, 0.0)
 
     # Place binder nodes (chain A) horizontally at y=3
     for i, nodeA in enumerate(interacting_binder_list):
-        sub_view_layout[nodeA] = tlp.Vec3f(i * space_x, 3.0, 0.0)
-
-    # Calculate edge lengths for original orientation
-    orig_length = calculate_edge_lengths(graph, interacting_binder_list + interacting_target_list, sub_view_layout)
-
-    # Try reversed target nodes
-    for i, nodeB in enumerate(reversed(interacting_target_list)):
-        sub_view_layout[nodeB] = tlp.Vec3f(i * space_x, 0.0, 0.0)
-
-    # Calculate edge lengths for reversed orientation
-    reversed_length = calculate_edge_lengths(graph, interacting_binder_list + interacting_target_list, sub_view_layout)
-
-    # Choose orientation with shorter total edge length
-    if reversed_length < orig_length:
-        # Keep the reversed orientation
-        pass
-    else:
-        # Revert back to original orientation
-        for i, nodeB in enumerate(interacting_target_list):
-            sub_view_layout[nodeB] = tlp.Vec3f(i * space_x, 0.0, 0.0)
+        sub_view_layout[nodeA] = tlp.Vec3f(i * space_x, space_y, 0.0)
 
 class BinderTargetInteraction(tlp.Algorithm):
     """
@@ -161,6 +163,10 @@ class BinderTargetInteraction(tlp.Algorithm):
         self.addBooleanParameter("include_vdw",
                                  "Include VDW interactions in the subgraph?",
                                  "True")
+        # Opening a view can be skipped when the plugin is run from a script
+        self.addBooleanParameter("create_view",
+                                 "Open a new node-link view?",
+                                 "True")
 
     def check(self):
         # Pre-check before run()
@@ -168,15 +174,16 @@ class BinderTargetInteraction(tlp.Algorithm):
 
     def run(self):
         # Retrieve user parameter
-        include_vdw = self.dataSet["include_vdw"]
+        include_vdw = bool(self.dataSet["include_vdw"])
 
-        # Identify interacting nodes
-        interacting_binder_list, interacting_target_list = identify_interacting_nodes(
+        # Identify interacting nodes and the edges between them
+        interacting_binder_list, interacting_target_list, interaction_edges = identify_interactions(
             self.graph, include_vdw)
             
         # Create or reset subgraph
         binder_target_sub = create_interaction_subgraph(
-            self.graph, interacting_binder_list, interacting_target_list, include_vdw)
+            self.graph, interacting_binder_list, interacting_target_list, include_vdw,
+            interaction_edges)
             
         # Layout the subgraph
         sub_view_layout = binder_target_sub.getLocalLayoutProperty("viewLayout")
@@ -188,15 +195,16 @@ class BinderTargetInteraction(tlp.Algorithm):
                 "Created subgraph 'BinderTargetInteraction' with bipartite layout for chain A/B interactions."
             )
 
-        nlv_binder_target_sub = tlpgui.createNodeLinkDiagramView(binder_target_sub)
+        if self.dataSet["create_view"]:
+            nlv_binder_target_sub = tlpgui.createNodeLinkDiagramView(binder_target_sub)
+
+            # set labels scaled to node sizes mode
+            renderingParameters = nlv_binder_target_sub.getRenderingParameters()
+            renderingParameters.setLabelScaled(True)
+            nlv_binder_target_sub.setRenderingParameters(renderingParameters)
 
-        # set labels scaled to node sizes mode
-        renderingParameters = nlv_binder_target_sub.getRenderingParameters()
-        renderingParameters.setLabelScaled(True)
-        nlv_binder_target_sub.setRenderingParameters(renderingParameters)
-        
-        # center the layout
-        nlv_binder_target_sub.centerView()
+            # center the layout
+            nlv_binder_target_sub.centerView()
 
         return True
 
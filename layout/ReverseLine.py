@@ -1,5 +1,6 @@
 from tulip import tlp
 import tulipplugins
+from operator import itemgetter
 
 def get_selected_nodes(graph, view_selection):
     """
@@ -12,7 +13,7 @@ def get_selected_nodes(graph, view_selection):
     Returns:
         List of selected nodes
     """
-    return [n for n in graph.getNodes() if view_selection[n]]
+    return list(view_selection.getNodesEqualTo(True, graph))
 
 def get_node_coordinates(graph, nodes, view_layout):
     """
@@ -26,7 +27,12 @@ def get_node_coordinates(graph, nodes, view_layout):
     Returns:
         List of tuples (node, x, y)
     """
-    return [(n, view_layout[n][0], view_layout[n][1]) for n in nodes]
+    coords = []
+    for n in nodes:
+        # one layout read per node
+        c = view_layout[n]
+        coords.append((n, c[0], c[1]))
+    return coords
 
 def determine_orientation(coords):
     """
@@ -38,11 +44,18 @@ def determine_orientation(coords):
     Returns:
         Tuple of (is_horizontal, range_x, range_y)
     """
-    xs = [c[1] for c in coords]
-    ys = [c[2] for c in coords]
-    
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
+    # bounding box in a single pass over the coordinates
+    _, min_x, min_y = coords[0]
+    max_x, max_y = min_x, min_y
+    for _, x, y in coords:
+        if x < min_x:
+            min_x = x
+        elif x > max_x:
+            max_x = x
+        if y < min_y:
+            min_y = y
+        elif y > max_y:
+            max_y = y
     
     range_x = max_x - min_x
     range_y = max_y - min_y
@@ -50,47 +63,6 @@ def determine_orientation(coords):
     is_horizontal = (range_x >= range_y)
     return is_horizontal, range_x, range_y
 
-def sort_coordinates(coords, is_horizontal):
-    """
-    Sort coordinates based on orientation.
-    
-    Args:
-        coords: List of (node, x, y) tuples
-        is_horizontal: Boolean indicating if line is horizontal
-        
-    Returns:
-        Sorted list of coordinates
-    """
-    if is_horizontal:
-        return sorted(coords, key=lambda c: c[1])
-    return sorted(coords, key=lambda c: c[2])
-
-def reverse_node_positions(graph, coords, view_layout, is_horizontal):
-    """
-    Reverse the positions of nodes while maintaining their relative positions.
-    
-    Args:
-        graph: The Tulip graph
-        coords: List of (node, x, y) tuples
-        view_layout: The layout property of the graph
-        is_horizontal: Boolean indicating if line is horizontal
-    """
-    # Extract the sorted positions
-    if is_horizontal:
-        sorted_positions = [c[1] for c in coords]
-    else:
-        sorted_positions = [c[2] for c in coords]
-    
-    # Reverse the positions
-    reversed_positions = list(reversed(sorted_positions))
-    
-    # Assign reversed positions back in the same sorted order
-    for i, (node, old_x, old_y) in enumerate(coords):
-        if is_horizontal:
-            view_layout[node] = tlp.Vec3f(reversed_positions[i], old_y, 0)
-        else:
-            view_layout[node] = tlp.Vec3f(old_x, reversed_positions[i], 0)
-
 class ReverseLine(tlp.Algorithm):
     """
     Detects whether the selected nodes form a mostly horizontal or mostly vertical line,
@@ -122,9 +94,14 @@ class ReverseLine(tlp.Algorithm):
         coords = get_node_coordinates(self.graph, selected_nodes, view_layout)
         is_horizontal, range_x, range_y = determine_orientation(coords)
         
-        # Sort and reverse positions
-        sorted_coords = sort_coordinates(coords, is_horizontal)
-        reverse_node_positions(self.graph, sorted_coords, view_layout, is_horizontal)
+        # The i-th node along the axis takes the coordinate of the i-th from the end
+        axis = 1 if is_horizontal else 2
+        ordered = sorted(coords, key=itemgetter(axis))
+        for (node, x, y), mirror in zip(ordered, reversed(ordered)):
+            if is_horizontal:
+                view_layout[node] = tlp.Vec3f(mirror[1], y, 0)
+            else:
+                view_layout[node] = tlp.Vec3f(x, mirror[2], 0)
 
         if self.pluginProgress:
             orientation = "horizontal" if is_horizontal else "vertical"
@@ -0,0 +1,65 @@
+import math
+import re
+
+# Shared helpers of the interaction layout plugins
+# (BinderIntraInteraction, BinderTargetInteraction, BinderTargetConnectedInteraction).
+
+# Position used for nodes whose 'position' cannot be read as an integer
+INVALID_POSITION = -999999
+
+def _is_non_vdw_interaction(int_type):
+    return bool(int_type) and not int_type.startswith("VDW")
+
+def interaction_filter(include_vdw):
+    """
+    Pick the filter deciding if an edge interaction string is kept,
+    once before a loop over edges.
+
+    Empty strings are always rejected, VDW interactions are kept only if
+    include_vdw is True, everything else (HBOND, IONIC, etc.) is kept.
+
+    Args:
+        include_vdw: Whether VDW interactions are kept
+
+    Returns:
+        A callable taking the interaction string (e.g. "HBOND:SC_MC", "VDW:SC_SC")
+    """
+    # with VDW kept, only empty strings are rejected
+    return bool if include_vdw else _is_non_vdw_interaction
+
+# "COV" prefix (case-sensitive) or "PEPTIDE" anywhere (any case), matched
+# without building an upper-cased copy of the string
+_COVALENT_RE = re.compile(r"^COV|(?i:PEPTIDE)")
+
+def is_covalent(int_type):
+    """
+    Decide if an interaction is covalent (these are skipped),
+    e.g. "COV:PEP", "COV", "PEPTIDE BOND".
+    """
+    if not int_type:
+        return False
+    return _COVALENT_RE.search(int_type) is not None
+
+def safe_pos(prop_position, n):
+    """
+    Safe integer conversion of the 'position' property of a node.
+
+    Args:
+        prop_position: The 'position' property of the graph
+        n: The node
+
+    Returns:
+        The position as an int, or INVALID_POSITION if it cannot be converted
+    """
+    v = prop_position[n]
+    if isinstance(v, int):
+        # IntegerProperty (as created by RINGImport)
+        return v
+    if isinstance(v, float):
+        return int(v) if math.isfinite(v) else INVALID_POSITION
+    if isinstance(v, str):
+        s = v.strip()
+        digits = s[1:] if s[:1] in ("+", "-") else s
+        if digits.isdigit():
+            return int(s)
+    return INVALID_POSITION